@@ -1,26 +1,79 @@
 # indexer/code_index.py
 import os
+import sys
+import hashlib
 import pickle
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Union, Iterator, Tuple, Any, TypeVar, Generic, Callable
+from typing import Dict, List, Set, Optional, Union, Iterator, Iterable, Tuple, Any, TypeVar, Generic, Callable
 from dataclasses import dataclass, field, asdict
 from functools import lru_cache
 import threading
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import re
 import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 
 from models import CodeElement, ElementType
 from parser import ASTParser
+from parser.ast_cache import ASTCache
+from scanner.lazy_scanner import get_python_files_batched
 
 # Type variable for generics
 T = TypeVar('T', bound=CodeElement)
 
-@dataclass
+# Number of recently parsed files kept for lazy element loading
+_PARSED_FILES_CACHE_SIZE = 64
+
+# Batches with fewer files to parse than this are parsed in-process, since
+# shipping them to worker processes costs more than it saves
+_PARALLEL_MIN_FILES = 8
+
+# Files handed to a worker process per task
+_PARALLEL_CHUNKSIZE = 16
+
+# Word tokenizer for search queries
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _make_element_id(module_path: str, name: str) -> str:
+    """Build the index key for an element; interned so the many index sets share one string."""
+    return sys.intern(f"{module_path}.{name}")
+
+
+@lru_cache(maxsize=None)
+def _get_parser(ast_cache_dir: Optional[str] = None, ast_cache_strict: bool = False) -> ASTParser:
+    """Return a process-wide ASTParser per AST cache configuration; it holds no per-file state."""
+    return ASTParser(ast_cache=ASTCache(ast_cache_dir, strict=ast_cache_strict) if ast_cache_dir else None)
+
+
+def _parse_elements(parser: ASTParser, file_path: Path) -> List[CodeElement]:
+    """
+    Parse a file into elements for the index, without their AST nodes.
+    
+    The index never reads ast_node, and keeping it would hold each
+    definition's subtree in memory and pickle it back from worker processes.
+    """
+    elements = parser.parse_file(file_path)
+    for element in elements:
+        element.ast_node = None
+    return elements
+
+
+def _parse_file_in_worker(file_path: Path, ast_cache_dir: Optional[str],
+                          ast_cache_strict: bool) -> List[CodeElement]:
+    """Parse a single file in a worker process, reusing that process's parser."""
+    return _parse_elements(_get_parser(ast_cache_dir, ast_cache_strict), file_path)
+
+
+@dataclass(slots=True)
 class ElementReference:
-    """Lightweight reference to a CodeElement for lazy loading."""
+    """Lightweight reference to a CodeElement for lazy loading.
+    
+    Slotted: a lazily loaded index holds one of these per element.
+    """
     element_id: str
     element_type: ElementType
     name: str
@@ -28,17 +81,19 @@ class ElementReference:
     file_path: Path
     line_range: Tuple[int, int]
     is_loaded: bool = False
+    parent_id: Optional[str] = None
     
     @classmethod
     def from_element(cls, element: CodeElement) -> 'ElementReference':
         """Create a reference from a full CodeElement."""
         return cls(
-            element_id=f"{element.module_path}.{element.name}",
+            element_id=_make_element_id(element.module_path, element.name),
             element_type=element.element_type,
             name=element.name,
             module_path=element.module_path,
             file_path=element.file_path,
-            line_range=(element.line_start, element.line_end)
+            line_range=(element.line_start, element.line_end),
+            parent_id=_make_element_id(element.module_path, element.parent_name) if element.parent_name else None
         )
 
 
@@ -53,7 +108,9 @@ class CodebaseIndex:
     def __init__(self, 
                  lazy_loading: bool = True, 
                  cache_size: int = 1000,
-                 search_index_all: bool = False):
+                 search_index_all: bool = False,
+                 ast_cache_dir: Optional[Union[str, Path]] = None,
+                 ast_cache_strict: bool = False):
         """
         Initialize the codebase index.
         
@@ -61,6 +118,10 @@ class CodebaseIndex:
             lazy_loading: Whether to use lazy loading
             cache_size: Size of the LRU cache for loaded elements
             search_index_all: Whether to build search index for all elements immediately
+            ast_cache_dir: Optional directory for a persistent AST cache, so
+                unchanged files are not re-parsed across runs
+            ast_cache_strict: Key AST cache entries by SHA-256 even when
+                xxhash is available (see ASTCache)
         """
         self.logger = logging.getLogger(__name__)
         
@@ -76,6 +137,11 @@ class CodebaseIndex:
         # Path-based lookup
         self._file_elements: Dict[Path, Set[str]] = defaultdict(set)  # file_path -> element_ids
         
+        # Every file defining each id, including duplicates that were not indexed
+        self._id_files: Dict[str, Set[Path]] = defaultdict(set)  # element_id -> file_paths
+        self._file_ids: Dict[Path, Set[str]] = defaultdict(set)  # file_path -> element_ids
+        self._file_mtimes: Dict[str, Tuple[int, int, Optional[str]]] = {}  # file_path -> (mtime_ns, size, sha256)
+        
         # Search indexes
         self._token_index: Dict[str, Set[str]] = defaultdict(set)  # token -> element_ids
         self._name_trie = Trie()  # Prefix tree for name lookups
@@ -89,6 +155,10 @@ class CodebaseIndex:
         
         # Caching
         self._element_cache = LRUCache(cache_size)
+        self._parsed_files = LRUCache(_PARSED_FILES_CACHE_SIZE)  # file path -> (mtime_ns, elements)
+        self.ast_cache_dir = ast_cache_dir
+        self.ast_cache_strict = ast_cache_strict
+        self._parser = _get_parser(str(ast_cache_dir) if ast_cache_dir else None, ast_cache_strict)
         
         # Concurrency control
         self._lock = threading.RLock()
@@ -105,65 +175,95 @@ class CodebaseIndex:
             element: Code element to add
             force_full: If True, always store the full element (not a reference)
         """
-        element_id = f"{element.module_path}.{element.name}"
-        
         with self._lock:
-            # Check for duplicates
-            if element_id in self._elements:
-                # Update if it's a reference and we have the full element
-                if isinstance(self._elements[element_id], ElementReference) and not isinstance(element, ElementReference):
-                    self._update_indexes(element_id, element)
-                    self._elements[element_id] = element
-                    self.loaded_elements += 1
-                return
+            self._add_element_locked(element, force_full)
+    
+    def add_elements(self, elements: Iterable[CodeElement], force_full: bool = False) -> int:
+        """
+        Add many elements to the index under a single lock acquisition.
+        
+        Args:
+            elements: Code elements to add
+            force_full: If True, always store the full elements (not references)
             
-            # Store either the full element or just a reference based on lazy loading setting
-            if self.lazy_loading and not force_full:
-                self._elements[element_id] = ElementReference.from_element(element)
-            else:
+        Returns:
+            Number of elements processed
+        """
+        count = 0
+        with self._lock:
+            for element in elements:
+                self._add_element_locked(element, force_full)
+                count += 1
+        return count
+    
+    def _add_element_locked(self, element: CodeElement, force_full: bool) -> None:
+        """Add an element to the index; the caller must hold the lock."""
+        element_id = _make_element_id(element.module_path, element.name)
+        
+        # Record the definition even if it turns out to be a duplicate, so it
+        # can take over the id when the indexed one is removed
+        file_path = Path(element.file_path)
+        self._id_files[element_id].add(file_path)
+        self._file_ids[file_path].add(element_id)
+        
+        # Check for duplicates
+        if element_id in self._elements:
+            # Update if it's a reference and we have the full element
+            if isinstance(self._elements[element_id], ElementReference) and not isinstance(element, ElementReference):
+                self._update_indexes(element_id, element)
                 self._elements[element_id] = element
                 self.loaded_elements += 1
-                
-                # Index for search if requested
-                if self.search_index_all:
-                    self._index_element_for_search(element)
-            
-            # Update indexes
-            self._update_indexes(element_id, element)
+            return
+        
+        # Store either the full element or just a reference based on lazy loading setting
+        if self.lazy_loading and not force_full:
+            self._elements[element_id] = ElementReference.from_element(element)
+        else:
+            self._elements[element_id] = element
+            self.loaded_elements += 1
             
-            # Track total elements
-            self.total_elements += 1
+            # Index for search if requested
+            if self.search_index_all:
+                self._index_element_for_search(element)
+        
+        # Update indexes
+        self._update_indexes(element_id, element)
+        
+        # Track total elements
+        self.total_elements += 1
     
     def _update_indexes(self, element_id: str, element: CodeElement) -> None:
         """Update all indexes with the element."""
+        # Read each element field once; this runs for every indexed element
+        name = element.name
+        module_path = element.module_path
+        element_type = element.element_type
+        parent_id = _make_element_id(module_path, element.parent_name) if element.parent_name else None
+        
         # Update module index
-        if element.module_path:
-            if element.module_path not in self._modules:
-                self._modules[element.module_path] = set()
-            self._modules[element.module_path].add(element_id)
+        if module_path:
+            self._modules.setdefault(module_path, set()).add(element_id)
         
         # Update type-specific indexes
-        if element.element_type == ElementType.CLASS:
-            self._classes[element.name] = element_id
-        elif element.element_type == ElementType.FUNCTION:
-            self._functions[element.name] = element_id
-        elif element.element_type == ElementType.METHOD:
+        if element_type == ElementType.CLASS:
+            self._classes[name] = element_id
+        elif element_type == ElementType.FUNCTION:
+            self._functions[name] = element_id
+        elif element_type == ElementType.METHOD:
             # For methods, track both by class and globally
-            if element.parent_name:
-                parent_id = f"{element.module_path}.{element.parent_name}"
-                self._methods[parent_id][element.name] = element_id
-            self._functions[element.name] = element_id
+            if parent_id:
+                self._methods[parent_id][name] = element_id
+            self._functions[name] = element_id
         
         # Update file index
         self._file_elements[element.file_path].add(element_id)
         
         # Update relationship maps
-        if element.parent_name:
-            parent_id = f"{element.module_path}.{element.parent_name}"
+        if parent_id:
             self._parent_children[parent_id].add(element_id)
             
         # Update name trie for prefix search
-        self._name_trie.insert(element.name, element_id)
+        self._name_trie.insert(name, element_id)
     
     def _index_element_for_search(self, element: CodeElement) -> None:
         """Add an element to the search index."""
@@ -172,11 +272,159 @@ class CodebaseIndex:
             element.generate_search_tokens()
             
         # Add to token index
-        element_id = f"{element.module_path}.{element.name}"
+        element_id = _make_element_id(element.module_path, element.name)
         for token in element.search_tokens:
             if len(token) > 2:  # Skip very short tokens
                 self._token_index[token].add(element_id)
     
+    def remove_file(self, file_path: Union[str, Path]) -> int:
+        """
+        Remove every element indexed from a file.
+        
+        The file is also dropped from the change manifest, so the next
+        build_index_from_directory call parses it again if it still exists.
+        
+        Args:
+            file_path: Path of the source file
+            
+        Returns:
+            Number of elements removed
+        """
+        with self._lock:
+            self._file_mtimes.pop(str(file_path), None)
+            removed_ids = self._remove_file_elements_locked([file_path])
+            self._restore_duplicates_locked(removed_ids)
+            return len(removed_ids)
+    
+    def _remove_file_elements_locked(self, file_paths: Iterable[Union[str, Path]]) -> Set[str]:
+        """
+        Remove files' elements from all indexes; the caller must hold the lock.
+        
+        Args:
+            file_paths: Paths of the source files
+            
+        Returns:
+            IDs of the removed elements, for _restore_duplicates_locked
+        """
+        removed_ids: Set[str] = set()
+        reference_ids: Set[str] = set()
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            for element_id in self._file_ids.pop(file_path, ()):
+                defining_files = self._id_files.get(element_id)
+                if defining_files is not None:
+                    defining_files.discard(file_path)
+                    if not defining_files:
+                        del self._id_files[element_id]
+            
+            for element_id in self._file_elements.pop(file_path, ()):
+                element = self._remove_element_locked(element_id)
+                removed_ids.add(element_id)
+                if isinstance(element, ElementReference):
+                    reference_ids.add(element_id)
+        
+        # A reference does not know the tokens it was indexed under (the token
+        # index may have been loaded from disk), so sweep the index once
+        if reference_ids and self._token_index:
+            for token in list(self._token_index):
+                token_ids = self._token_index[token]
+                token_ids -= reference_ids
+                if not token_ids:
+                    del self._token_index[token]
+        return removed_ids
+    
+    def _restore_duplicates_locked(self, element_ids: Iterable[str]) -> None:
+        """
+        Re-index removed IDs that another file still defines; the caller must hold the lock.
+        
+        IDs are not unique across files and only the first definition is
+        indexed, so removing one file can uncover another file's definition.
+        
+        Args:
+            element_ids: IDs of removed elements
+        """
+        for element_id in element_ids:
+            if element_id in self._elements:
+                continue
+            
+            for file_path in list(self._id_files.get(element_id, ())):
+                try:
+                    file_elements = self._parse_file_cached(file_path)
+                except (OSError, SyntaxError, ValueError) as e:
+                    self.logger.warning(f"Could not re-read {file_path} for {element_id}: {e}")
+                    file_elements = []
+                
+                element = next((candidate for candidate in file_elements
+                                if _make_element_id(candidate.module_path, candidate.name) == element_id),
+                               None)
+                if element is not None:
+                    self._add_element_locked(element, force_full=False)
+                    break
+                
+                # The file changed since it was indexed; have the next build parse it
+                self._file_mtimes.pop(str(file_path), None)
+    
+    def _remove_element_locked(self, element_id: str) -> Optional[Union[CodeElement, ElementReference]]:
+        """
+        Undo _add_element_locked for one element; the caller must hold the lock.
+        
+        Search tokens are only removed for full elements; the caller clears
+        removed references from the token index.
+        
+        Returns:
+            The removed element or reference, or None if it was not indexed
+        """
+        element = self._elements.pop(element_id, None)
+        if element is None:
+            return None
+        
+        name = element.name
+        module_path = element.module_path
+        if isinstance(element, ElementReference):
+            parent_id = element.parent_id
+            search_tokens = ()
+        else:
+            parent_id = _make_element_id(module_path, element.parent_name) if element.parent_name else None
+            search_tokens = getattr(element, 'search_tokens', None) or ()
+            self.loaded_elements -= 1
+        
+        # Module index
+        module_ids = self._modules.get(module_path)
+        if module_ids is not None:
+            module_ids.discard(element_id)
+            if not module_ids:
+                del self._modules[module_path]
+        
+        # Type-specific indexes, unless a later element took over the name
+        if self._classes.get(name) == element_id:
+            del self._classes[name]
+        if self._functions.get(name) == element_id:
+            del self._functions[name]
+        if parent_id:
+            methods = self._methods.get(parent_id)
+            if methods is not None and methods.get(name) == element_id:
+                del methods[name]
+                if not methods:
+                    del self._methods[parent_id]
+        
+        # Relationship maps
+        if parent_id:
+            self._parent_children.get(parent_id, set()).discard(element_id)
+        self._parent_children.pop(element_id, None)
+        
+        # Search indexes
+        for token in search_tokens:
+            token_ids = self._token_index.get(token)
+            if token_ids is not None:
+                token_ids.discard(element_id)
+                if not token_ids:
+                    del self._token_index[token]
+        self._name_trie.remove(name, element_id)
+        
+        self._element_cache.pop(element_id)
+        self.total_elements -= 1
+        return element
+    
     def get_element(self, element_id: str) -> Optional[CodeElement]:
         """
         Get an element by its ID, loading it if necessary.
@@ -269,7 +517,8 @@ class CodebaseIndex:
             List of matching elements
         """
         element_ids = self._name_trie.find_prefix(prefix, max_results)
-        return [self.get_element(eid) for eid in element_ids if self.get_element(eid) is not None]
+        # Resolve each ID once; loading an element may re-parse its file
+        return [element for element in map(self.get_element, element_ids) if element is not None]
     
     def search(self, query: str, element_type: Optional[ElementType] = None, max_results: int = 100) -> List[CodeElement]:
         """
@@ -283,8 +532,12 @@ class CodebaseIndex:
         Returns:
             List of matching elements
         """
-        # Clean and tokenize the query
-        tokens = set(re.findall(r'\w+', query.lower()))
+        # Clean and tokenize the query, skipping very short tokens
+        tokens = {token for token in _TOKEN_RE.findall(query.lower()) if len(token) > 2}
+        
+        # Nothing to score: skip the lock and the token index scan
+        if not tokens:
+            return []
         
         # Score map: element_id -> score
         scores = defaultdict(int)
@@ -292,9 +545,6 @@ class CodebaseIndex:
         with self._lock:
             # For each token, find matching elements
             for token in tokens:
-                if len(token) <= 2:
-                    continue  # Skip very short tokens
-                    
                 # Exact token match
                 if token in self._token_index:
                     for element_id in self._token_index[token]:
@@ -414,22 +664,23 @@ class CodebaseIndex:
             
         # Parse the file and extract just this element
         try:
-            parser = ASTParser()
-            file_elements = parser.parse_file(reference.file_path)
+            file_elements = self._parse_file_cached(reference.file_path)
             
             # Find our element
-            for element_id, element in file_elements.items():
+            for element in file_elements:
                 if (element.name == reference.name and 
                     element.element_type == reference.element_type and 
                     element.line_start == reference.line_range[0]):
                     
                     # Update our index with the full element
+                    element_id = reference.element_id
                     self._elements[element_id] = element
                     self._element_cache.put(element_id, element)
                     self.loaded_elements += 1
                     
                     # Add to search index if needed
-                    self._index_element_for_search(element)
+                    if self.search_index_all:
+                        self._index_element_for_search(element)
                     
                     return element
             
@@ -441,6 +692,29 @@ class CodebaseIndex:
             self.logger.error(f"Error loading element {reference.element_id}: {e}")
             return None
     
+    def _parse_file_cached(self, file_path: Path) -> List[CodeElement]:
+        """
+        Parse a file, reusing the previous result while its mtime is unchanged.
+        
+        Loading several elements from the same file would otherwise re-parse
+        the whole file once per element.
+        
+        Args:
+            file_path: Path to the source file
+            
+        Returns:
+            Elements extracted from the file
+        """
+        key = str(file_path)
+        mtime_ns = os.stat(key).st_mtime_ns
+        cached = self._parsed_files.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        file_elements = _parse_elements(self._parser, file_path)
+        self._parsed_files.put(key, (mtime_ns, file_elements))
+        return file_elements
+    
     def save_to_file(self, file_path: Union[str, Path]) -> None:
         """
         Save the index to a file.
@@ -458,18 +732,14 @@ class CodebaseIndex:
             # Convert all elements to a serializable format
             serializable_elements = {}
             for element_id, element in self._elements.items():
-                if isinstance(element, ElementReference):
-                    # For references, store the reference data
-                    serializable_elements[element_id] = {
-                        'type': 'reference',
-                        'data': asdict(element)
-                    }
-                else:
-                    # For full elements, store as dict
-                    serializable_elements[element_id] = {
-                        'type': 'element',
-                        'data': element.to_dict()
-                    }
+                # Full elements are stored as references too and re-parsed on
+                # demand after loading
+                if not isinstance(element, ElementReference):
+                    element = ElementReference.from_element(element)
+                serializable_elements[element_id] = {
+                    'type': 'reference',
+                    'data': asdict(element)
+                }
             
             # Prepare the full index data
             index_data = {
@@ -479,8 +749,10 @@ class CodebaseIndex:
                 'functions': self._functions,
                 'methods': {k: dict(v) for k, v in self._methods.items()},
                 'file_elements': {str(k): list(v) for k, v in self._file_elements.items()},
+                'id_files': {k: [str(p) for p in v] for k, v in self._id_files.items()},
                 'parent_children': {k: list(v) for k, v in self._parent_children.items()},
                 'token_index': {k: list(v) for k, v in self._token_index.items()},
+                'file_mtimes': dict(self._file_mtimes),
                 'stats': {
                     'total_elements': self.total_elements,
                     'loaded_elements': self.loaded_elements
@@ -520,14 +792,18 @@ class CodebaseIndex:
             if element_data['type'] == 'reference':
                 # Create a reference
                 ref_data = element_data['data']
+                element_type = ref_data['element_type']
+                if isinstance(element_type, str):
+                    element_type = ElementType[element_type]
                 reference = ElementReference(
                     element_id=ref_data['element_id'],
-                    element_type=ElementType[ref_data['element_type']],
+                    element_type=element_type,
                     name=ref_data['name'],
                     module_path=ref_data['module_path'],
                     file_path=Path(ref_data['file_path']),
                     line_range=tuple(ref_data['line_range']),
-                    is_loaded=ref_data['is_loaded']
+                    is_loaded=ref_data['is_loaded'],
+                    parent_id=ref_data.get('parent_id')
                 )
                 index._elements[element_id] = reference
             else:
@@ -547,6 +823,15 @@ class CodebaseIndex:
         index._file_elements = defaultdict(set)
         for k, v in index_data['file_elements'].items():
             index._file_elements[Path(k)] = set(v)
+        
+        # Older index files only know the indexed definition of each id
+        id_files = index_data.get('id_files') or {
+            element_id: [k] for k, v in index_data['file_elements'].items() for element_id in v
+        }
+        for element_id, paths in id_files.items():
+            for p in paths:
+                index._id_files[element_id].add(Path(p))
+                index._file_ids[Path(p)].add(element_id)
             
         index._parent_children = defaultdict(set)
         for k, v in index_data['parent_children'].items():
@@ -556,6 +841,9 @@ class CodebaseIndex:
         for k, v in index_data['token_index'].items():
             index._token_index[k] = set(v)
             
+        # Older index files have no manifest; every file is then re-parsed
+        index._file_mtimes = dict(index_data.get('file_mtimes', {}))
+            
         # Restore stats
         index.total_elements = index_data['stats']['total_elements']
         index.loaded_elements = 0  # We're not loading any elements fully
@@ -568,64 +856,176 @@ class CodebaseIndex:
             
         return index
     
+    def needs_reindexing(self, file_path: Union[str, Path],
+                         stat_result: Optional[os.stat_result] = None
+                         ) -> Tuple[bool, Optional[Tuple[int, int, Optional[str]]]]:
+        """
+        Check whether a file changed since it was last indexed.
+        
+        Matching mtime and size count as unchanged without reading the file.
+        Otherwise the content digest decides, so a touched-but-identical file
+        is still skipped. Files seen for the first time are not hashed, since
+        they are parsed anyway; their digest is filled in on the first later
+        mismatch. The manifest itself is not modified; the caller records the
+        returned state once the file's elements are indexed.
+        
+        Args:
+            file_path: Path to the source file
+            stat_result: The file's stat result if the caller already has one,
+                e.g. from the directory scan
+            
+        Returns:
+            Tuple of whether the file must be parsed again and its current
+            (mtime_ns, size, sha256 or None) state, or None if that is
+            unchanged or the file could not be read
+        """
+        key = str(file_path)
+        try:
+            stat = stat_result if stat_result is not None else os.stat(key)
+            previous = self._file_mtimes.get(key)
+            if previous is None:
+                return True, (stat.st_mtime_ns, stat.st_size, None)
+            if previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                return False, None
+            
+            with open(key, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            # Let the parser report unreadable files
+            return True, None
+        
+        state = (stat.st_mtime_ns, stat.st_size, digest)
+        return previous[2] is None or previous[2] != digest, state
+    
     def build_index_from_directory(self, directory: Union[str, Path], 
                                   batch_size: int = 100, 
-                                  max_memory_mb: int = 500) -> None:
+                                  max_memory_mb: int = 500,
+                                  max_workers: Optional[int] = None) -> None:
         """
         Build the index from a directory.
         
+        Files unchanged since they were last indexed (see needs_reindexing)
+        are skipped, so rebuilding a loaded index only parses changed files.
+        Elements previously indexed from changed or deleted files are removed
+        first, so renamed definitions do not linger.
+        
         Args:
             directory: Directory to index
             batch_size: Number of files to process in each batch
             max_memory_mb: Maximum memory to use in MB
+            max_workers: Number of processes used to parse files; defaults to
+                the CPU count, and 1 parses everything in this process
         """
-        from ..scanner import FileCrawler, get_python_files_batched
-        from parser import ASTParser
-        
         dir_path = Path(directory) if isinstance(directory, str) else directory
         
+        # Manifest keys seen during this scan; the rest of this directory's
+        # entries belong to deleted files
+        seen_files: Set[str] = set()
+        
+        # Stat results from the scan, consumed by needs_reindexing so each
+        # file is stat()ed once per build
+        stat_cache: Dict[str, os.stat_result] = {}
+        
         # Track progress
         start_time = time.time()
         files_processed = 0
+        files_skipped = 0
         elements_found = 0
         
-        # Create parser
-        parser = ASTParser()
+        # Reuse the shared parser
+        parser = self._parser
+        ast_cache_dir = str(self.ast_cache_dir) if self.ast_cache_dir else None
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        
+        # Worker pool, started on the first batch large enough to need it
+        executor: Optional[ProcessPoolExecutor] = None
         
         # Process files in batches
-        with get_python_files_batched(str(dir_path), batch_size=batch_size) as batches:
-            for batch in batches:
-                batch_elements = 0
-                
-                # Process each file in the batch
-                for file_path in batch:
-                    # Parse the file
-                    file_elements = parser.parse_file(file_path)
+        try:
+            with get_python_files_batched(str(dir_path), batch_size=batch_size,
+                                          stat_cache=stat_cache) as batches:
+                for batch in batches:
+                    files_to_parse = []
+                    new_states = {}
+                    for file_path in batch:
+                        key = str(file_path)
+                        seen_files.add(key)
+                        changed, state = self.needs_reindexing(file_path, stat_cache.pop(key, None))
+                        if changed:
+                            files_to_parse.append(file_path)
+                            new_states[key] = state
+                        else:
+                            files_skipped += 1
+                            if state is not None:
+                                # Touched but identical: nothing to reindex
+                                self._file_mtimes[key] = state
                     
-                    # Add elements to index
-                    for element_id, element in file_elements.items():
-                        self.add_element(element)
-                        batch_elements += 1
+                    # Parse the changed files, in worker processes when worthwhile
+                    parsed_elements = []
+                    if max_workers > 1 and len(files_to_parse) >= _PARALLEL_MIN_FILES:
+                        if executor is None:
+                            executor = ProcessPoolExecutor(max_workers=max_workers)
+                        results = executor.map(_parse_file_in_worker, files_to_parse,
+                                               itertools.repeat(ast_cache_dir),
+                                               itertools.repeat(self.ast_cache_strict),
+                                               chunksize=_PARALLEL_CHUNKSIZE)
+                    else:
+                        results = (_parse_elements(parser, file_path) for file_path in files_to_parse)
+                    for file_elements in results:
+                        parsed_elements.extend(file_elements)
                 
-                # Update stats
-                files_processed += len(batch)
-                elements_found += batch_elements
+                    # Swap the changed files' old elements for the new ones
+                    with self._lock:
+                        removed_ids = self._remove_file_elements_locked(files_to_parse)
+                        batch_elements = self.add_elements(parsed_elements)
+                        self._restore_duplicates_locked(removed_ids)
+                        
+                        # Only now are the files' current elements indexed; a
+                        # failed parse above leaves their old state to retry
+                        for key, state in new_states.items():
+                            if state is None:
+                                self._file_mtimes.pop(key, None)
+                            else:
+                                self._file_mtimes[key] = state
+                
+                    # Update stats
+                    files_processed += len(batch)
+                    elements_found += batch_elements
                 
-                # Log progress
-                elapsed = time.time() - start_time
-                self.logger.info(f"Processed {files_processed} files, found {elements_found} elements in {elapsed:.2f}s")
+                    # Log progress
+                    elapsed = time.time() - start_time
+                    self.logger.info(f"Processed {files_processed} files, found {elements_found} elements in {elapsed:.2f}s")
                 
-                # Check memory usage if requested
-                if max_memory_mb > 0:
-                    # This is a simplified approach - a real implementation would
-                    # monitor actual memory usage and take action if needed
-                    if self.loaded_elements > (max_memory_mb * 1024 * 1024) / 1000:  # Rough estimate
-                        self._element_cache.clear()
-                        # Force garbage collection in a real implementation
+                    # Check memory usage if requested
+                    if max_memory_mb > 0:
+                        # This is a simplified approach - a real implementation would
+                        # monitor actual memory usage and take action if needed
+                        if self.loaded_elements > (max_memory_mb * 1024 * 1024) / 1000:  # Rough estimate
+                            self._element_cache.clear()
+                            # Force garbage collection in a real implementation
+        finally:
+            if executor is not None:
+                # After a failed parse, don't finish queued files just to discard them
+                executor.shutdown(cancel_futures=True)
+        
+        # Drop files that were indexed from this directory but no longer exist
+        root = dir_path.resolve()
+        deleted_files = [key for key in self._file_mtimes
+                         if key not in seen_files and Path(key).is_relative_to(root)]
+        if deleted_files:
+            # One removal pass, so ids shared between deleted files are not
+            # restored from files that are about to be removed too
+            with self._lock:
+                for key in deleted_files:
+                    self._file_mtimes.pop(key, None)
+                removed_ids = self._remove_file_elements_locked(deleted_files)
+                self._restore_duplicates_locked(removed_ids)
         
         # Final stats
         total_time = time.time() - start_time
-        self.logger.info(f"Indexing complete: {files_processed} files, {elements_found} elements in {total_time:.2f}s")
+        self.logger.info(f"Indexing complete: {files_processed} files ({files_skipped} unchanged), "
+                         f"{elements_found} elements in {total_time:.2f}s")
     
     def clear(self) -> None:
         """Clear the index."""
@@ -636,10 +1036,14 @@ class CodebaseIndex:
             self._functions.clear()
             self._methods.clear()
             self._file_elements.clear()
+            self._id_files.clear()
+            self._file_ids.clear()
+            self._file_mtimes.clear()
             self._token_index.clear()
             self._name_trie = Trie()
             self._parent_children.clear()
             self._element_cache.clear()
+            self._parsed_files.clear()
             self.total_elements = 0
             self.loaded_elements = 0
 
@@ -649,10 +1053,13 @@ class CodebaseIndex:
 class LRUCache:
     """Simple LRU cache implementation."""
     
+    __slots__ = ("capacity", "_cache", "_lock")
+    
     def __init__(self, capacity: int):
         self.capacity = capacity
-        self._cache = {}
-        self._usage_list = []
+        # Ordered from least to most recently used; reordering and
+        # eviction are O(1), unlike removing keys from a usage list
+        self._cache: OrderedDict = OrderedDict()
         self._lock = threading.RLock()
     
     def get(self, key: str) -> Optional[Any]:
@@ -662,8 +1069,7 @@ class LRUCache:
                 return None
                 
             # Update usage order
-            self._usage_list.remove(key)
-            self._usage_list.append(key)
+            self._cache.move_to_end(key)
             
             return self._cache[key]
     
@@ -672,35 +1078,37 @@ class LRUCache:
         with self._lock:
             # If key exists, update usage
             if key in self._cache:
-                self._usage_list.remove(key)
+                self._cache.move_to_end(key)
             elif len(self._cache) >= self.capacity:
                 # Make room by removing oldest item
                 self.evict_oldest()
                 
             # Add new item
             self._cache[key] = value
-            self._usage_list.append(key)
+    
+    def pop(self, key: str) -> Optional[Any]:
+        """Remove an item from the cache, returning it if present."""
+        with self._lock:
+            return self._cache.pop(key, None)
     
     def evict_oldest(self) -> None:
         """Remove the oldest item from the cache."""
         with self._lock:
-            if not self._usage_list:
-                return
-                
-            oldest = self._usage_list.pop(0)
-            if oldest in self._cache:
-                del self._cache[oldest]
+            if self._cache:
+                self._cache.popitem(last=False)
     
     def clear(self) -> None:
         """Clear the cache."""
         with self._lock:
             self._cache.clear()
-            self._usage_list.clear()
 
 
 class TrieNode:
     """Node in a trie (prefix tree)."""
     
+    # One node per distinct name prefix character, so keep them dict-free
+    __slots__ = ("children", "is_end", "element_ids")
+    
     def __init__(self):
         self.children = {}
         self.is_end = False
@@ -712,6 +1120,8 @@ class Trie:
     Trie (prefix tree) for efficient prefix searches.
     """
     
+    __slots__ = ("root",)
+    
     def __init__(self):
         self.root = TrieNode()
     
@@ -719,12 +1129,25 @@ class Trie:
         """Insert a word and associated element ID into the trie."""
         node = self.root
         for char in word:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+            # Single probe on the common path where the prefix already exists
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+            node = child
         node.is_end = True
         node.element_ids.add(element_id)
     
+    def remove(self, word: str, element_id: str) -> None:
+        """Remove an element ID stored under a word; emptied nodes are kept."""
+        node = self.root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return
+        node.element_ids.discard(element_id)
+        if not node.element_ids:
+            node.is_end = False
+    
     def find_prefix(self, prefix: str, max_results: int = 100) -> List[str]:
         """Find all element IDs with the given prefix."""
         node = self.root
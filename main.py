@@ -45,18 +45,18 @@ def main():
 
     # Step 3: Index the elements
     index = CodebaseIndex()
-    for element in all_elements.values():
-        index.add_element(element)
+    index.add_elements(all_elements.values())
 
     # Example query (adjust as needed)
     search_term = "parse"
     results = index.search(search_term)
-    print(f"\n🔍 Search results for '{search_term}':")
-    print("\nAll parsed elements:")
-    for name in all_elements.keys():
-        print(f"- {name}")
-    for res in results:
-        print(f"- {res.qualified_name} ({res.element_type})")
+    # Build the report once and emit it in a single write instead of one
+    # print() (lock + flush) per element.
+    out = [f"\n🔍 Search results for '{search_term}':", "\nAll parsed elements:"]
+    out.extend(f"- {name}" for name in all_elements)
+    out.extend(f"- {res.qualified_name} ({res.element_type})" for res in results)
+    out.append("")
+    sys.stdout.write("\n".join(out))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+# parser/ast_cache.py
+import ast
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import xxhash
+except ImportError:  # optional; keys fall back to SHA-256
+    xxhash = None
+
+# Bump when the cached payload format changes
+CACHE_SCHEMA_VERSION = 1
+
+
+class ASTCache:
+    """
+    Persistent on-disk cache of parsed module ASTs.
+
+    Entries are keyed by a digest of the raw source bytes, so unchanged files
+    are served from disk regardless of their mtime, and edited files simply
+    miss. Entries are grouped per interpreter version and schema version,
+    because ``ast`` node layouts differ between Python releases.
+
+    Keys use XXH3-128 when the ``xxhash`` package is installed, which keeps
+    hashing cheap on large files, and SHA-256 otherwise.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = ".ast_cache",
+                 logger: Optional[logging.Logger] = None,
+                 strict: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached trees; created on first store
+            logger: Optional logger for cache read/write failures
+            strict: Always key entries by SHA-256, for sources that may be
+                crafted to collide under a non-cryptographic hash
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.hash_name = "sha256" if strict or xxhash is None else "xxh3"
+        # Keys from different hashes must never share a directory
+        tag = f"py{sys.version_info[0]}{sys.version_info[1]}-v{CACHE_SCHEMA_VERSION}-{self.hash_name}"
+        self.cache_dir = Path(cache_dir) / tag
+        self.hits = 0
+        self.misses = 0
+
+    def source_key(self, source: bytes) -> str:
+        """Return the cache key for the given source bytes."""
+        if self.hash_name == "xxh3":
+            return xxhash.xxh3_128(source).hexdigest()
+        return hashlib.sha256(source).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pickle"
+
+    def load(self, source: bytes) -> Optional[ast.Module]:
+        """
+        Look up a cached tree for the given source.
+
+        Args:
+            source: Raw file contents
+
+        Returns:
+            The cached ast.Module, or None on a miss or unreadable entry
+        """
+        path = self._entry_path(self.source_key(source))
+        try:
+            with open(path, 'rb') as f:
+                tree = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable AST cache entry {path}: {e}")
+            return None
+        return tree if isinstance(tree, ast.Module) else None
+
+    def store(self, source: bytes, tree: ast.Module, filename: str = "<unknown>") -> None:
+        """
+        Write a parsed tree to the cache.
+
+        The entry is written to a temporary file and renamed into place so
+        concurrent indexers never observe a partially written pickle. Trees
+        that cannot be pickled, such as very long elif chains that exceed the
+        recursion limit, are logged and left uncached.
+
+        Args:
+            source: Raw file contents the tree was parsed from
+            tree: Parsed module
+            filename: Source filename, for log messages
+        """
+        path = self._entry_path(self.source_key(source))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            self.logger.warning(f"Could not write AST cache entry {path}: {e}")
+        except (RecursionError, pickle.PicklingError) as e:
+            self.logger.warning(f"Not caching AST for {filename}, tree cannot be pickled: {e!r}")
+
+    def parse(self, source: bytes, filename: str = "<unknown>") -> ast.Module:
+        """
+        Return the tree for ``source``, parsing and caching it on a miss.
+
+        Args:
+            source: Raw file contents
+            filename: Filename reported in SyntaxErrors
+
+        Returns:
+            Parsed module
+
+        Raises:
+            SyntaxError: If the source does not parse (nothing is cached)
+        """
+        tree = self.load(source)
+        if tree is not None:
+            self.hits += 1
+            return tree
+
+        self.misses += 1
+        tree = ast.parse(source, filename=filename)
+        self.store(source, tree, filename=filename)
+        return tree
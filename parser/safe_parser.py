@@ -14,9 +14,12 @@ from scanner.file_scanner import FileCrawler
 
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsingError:
-    """Represents an error encountered during parsing."""
+    """Represents an error encountered during parsing.
+
+    Slotted because a parser collects one of these per failed file.
+    """
     file_path: Path
     error_type: str
     error_message: str
@@ -2,14 +2,23 @@ from typing import List, Optional
 import ast
 from models.function import FunctionSignature, ParameterSignature, FunctionElement
 from models.semantic_nodes import ElementType
+from parser.ast_cache import ASTCache
 
 
 
 class ASTParser:
+    def __init__(self, ast_cache: Optional[ASTCache] = None):
+        self.ast_cache = ast_cache
+
     def parse_file(self, file_path: str) -> List[FunctionElement]:
-        with open(file_path, "r", encoding="utf-8") as f:
+        # Read raw bytes: ast.parse decodes them itself (honouring PEP 263
+        # coding cookies) and the AST cache keys on the exact bytes
+        with open(file_path, "rb") as f:
             source = f.read()
-        ast_tree = ast.parse(source, filename=file_path)
+        if self.ast_cache is not None:
+            ast_tree = self.ast_cache.parse(source, filename=str(file_path))
+        else:
+            ast_tree = ast.parse(source, filename=file_path)
         extractor = CodeElementExtractor(file_path)
         elements = list(extractor.extract_elements(ast_tree).values())
         return elements
@@ -1,6 +1,6 @@
 import os
 import pathlib
-from typing import List, Set, Optional, Iterator
+from typing import List, Set, Optional, Iterator, Union
 
 class FileCrawler:
     """Recursively scans directories for Python source files with configurable exclusions."""
@@ -44,48 +44,51 @@ class FileCrawler:
             
         return list(self._scan_recursive(root))
     
-    def _scan_recursive(self, directory: pathlib.Path) -> Iterator[pathlib.Path]:
+    def _scan_recursive(self, directory: Union[str, pathlib.Path]) -> Iterator[pathlib.Path]:
         """Yield valid Python files from directory and subdirectories."""
         try:
-            for item in directory.iterdir():
-                # Skip hidden directories
-                if item.is_dir() and item.name.startswith('.'):
-                    continue
+            # os.scandir answers the type checks below from the directory
+            # listing itself, and we only build Path objects for matches
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Handle symbolic links based on configuration
+                    if not self.follow_symlinks and entry.is_symlink():
+                        continue
                     
-                # Skip excluded directories
-                if item.is_dir() and item.name in self.excluded_dirs:
-                    continue
-                
-                # Handle symbolic links based on configuration
-                if item.is_symlink() and not self.follow_symlinks:
-                    continue
-                
-                # Recursively process directories
-                if item.is_dir():
-                    yield from self._scan_recursive(item)
-                    
-                # Process Python files
-                elif item.suffix.lower() == '.py':
-                    if self._validate_python_file(item):
-                        yield item
+                    if entry.is_dir():
+                        # Skip hidden and excluded directories
+                        if entry.name.startswith('.') or entry.name in self.excluded_dirs:
+                            continue
+                        
+                        # Recursively process directories
+                        yield from self._scan_recursive(entry.path)
+                        
+                    # Process Python files
+                    elif entry.name.lower().endswith('.py'):
+                        file_path = pathlib.Path(entry.path)
+                        if self._validate_python_file(file_path, entry):
+                            yield file_path
                         
         except (PermissionError, OSError):
             # Skip directories we can't access
             pass
     
-    def _validate_python_file(self, file_path: pathlib.Path) -> bool:
+    def _validate_python_file(self, file_path: pathlib.Path, entry: Optional[os.DirEntry] = None) -> bool:
         """
         Validate that a file is a proper Python source file with UTF-8 encoding.
         
         Args:
             file_path: Path to the file
+            entry: Directory entry the path came from; its cached stat result
+                is reused instead of stat()ing the file again
             
         Returns:
             True if file is a valid Python file, False otherwise
         """
         try:
             # Check file size
-            if file_path.stat().st_size > self.max_file_size:
+            stat_result = entry.stat() if entry is not None else file_path.stat()
+            if stat_result.st_size > self.max_file_size:
                 return False
                 
             # Validate UTF-8 encoding by attempting to read the file
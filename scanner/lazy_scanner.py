@@ -1,6 +1,6 @@
 import os
 import pathlib
-from typing import List, Set, Optional, Iterator, Union, Iterable
+from typing import List, Set, Dict, Optional, Iterator, Union, Iterable
 from contextlib import contextmanager
 import itertools
 
@@ -12,7 +12,8 @@ class FileCrawler:
         follow_symlinks: bool = False,
         excluded_dirs: Optional[Set[str]] = None,
         max_file_size_mb: int = 10,
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        stat_cache: Optional[Dict[str, os.stat_result]] = None
     ):
         # Default directories to exclude
         self.excluded_dirs = {
@@ -27,6 +28,10 @@ class FileCrawler:
         self.follow_symlinks = follow_symlinks
         self.max_file_size = max_file_size_mb * 1024 * 1024  # Convert to bytes
         self.batch_size = batch_size
+        
+        # When given, filled with the stat result of every accepted file so
+        # callers can reuse it instead of stat()ing the file again
+        self.stat_cache = stat_cache
     
     def scan_directory(self, root_path: str, lazy: bool = False) -> Union[List[pathlib.Path], Iterator[pathlib.Path]]:
         """
@@ -81,53 +86,59 @@ class FileCrawler:
     
     def _scan_recursive(self, directory: pathlib.Path) -> Iterator[pathlib.Path]:
         """Yield valid Python files from directory and subdirectories."""
-        try:
-            for item in directory.iterdir():
-                # Skip hidden directories
-                if item.is_dir() and item.name.startswith('.'):
-                    continue
-                    
-                # Skip excluded directories
-                if item.is_dir() and item.name in self.excluded_dirs:
-                    continue
-                
-                # Handle symbolic links based on configuration
-                if item.is_symlink() and not self.follow_symlinks:
-                    continue
-                
-                # Recursively process directories
-                if item.is_dir():
-                    yield from self._scan_recursive(item)
-                    
-                # Process Python files
-                elif item.suffix.lower() == '.py':
-                    if self._validate_python_file(item):
-                        yield item
+        # Walk with os.scandir and an explicit stack of directories: type checks
+        # are answered from the directory listing, and no recursion depth or
+        # per-level generator is needed for deep trees
+        pending = [directory]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        # Handle symbolic links based on configuration
+                        if not self.follow_symlinks and entry.is_symlink():
+                            continue
                         
-        except (PermissionError, OSError):
-            # Skip directories we can't access
-            pass
+                        if entry.is_dir():
+                            # Skip hidden and excluded directories
+                            if entry.name.startswith('.') or entry.name in self.excluded_dirs:
+                                continue
+                            pending.append(entry.path)
+                            
+                        # Process Python files
+                        elif entry.name.lower().endswith('.py'):
+                            file_path = pathlib.Path(entry.path)
+                            if self._validate_python_file(file_path, entry):
+                                yield file_path
+                            
+            except (PermissionError, OSError):
+                # Skip directories we can't access
+                pass
     
-    def _validate_python_file(self, file_path: pathlib.Path) -> bool:
+    def _validate_python_file(self, file_path: pathlib.Path, entry: Optional[os.DirEntry] = None) -> bool:
         """
         Validate that a file is a proper Python source file with UTF-8 encoding.
         
         Args:
             file_path: Path to the file
+            entry: Directory entry the path came from; its cached stat result
+                is reused instead of stat()ing the file again
             
         Returns:
             True if file is a valid Python file, False otherwise
         """
         try:
             # Check file size
-            if file_path.stat().st_size > self.max_file_size:
+            stat_result = entry.stat() if entry is not None else file_path.stat()
+            if stat_result.st_size > self.max_file_size:
                 return False
                 
             # Validate UTF-8 encoding by attempting to read the file
             with open(file_path, 'r', encoding='utf-8') as f:
                 # Just read a small chunk to validate encoding
                 f.read(1024)
-                
+            
+            if self.stat_cache is not None:
+                self.stat_cache[str(file_path)] = stat_result
             return True
             
         except UnicodeDecodeError:
@@ -138,7 +149,7 @@ class FileCrawler:
             return False
     
     @contextmanager
-    def batch_processor(self, root_path: str) -> Iterator[List[pathlib.Path]]:
+    def batch_processor(self, root_path: str) -> Iterator[Iterator[List[pathlib.Path]]]:
         """
         Context manager that yields batches of files to process.
         Helps control memory usage for large repositories.
@@ -147,16 +158,19 @@ class FileCrawler:
             root_path: Directory to scan
             
         Yields:
-            Batches of paths as lists, each containing at most batch_size files
+            Iterator of batches, each a list of at most batch_size paths
         """
         file_iterator = self.scan_directory(root_path, lazy=True)
         
-        try:
+        def batches() -> Iterator[List[pathlib.Path]]:
             while True:
                 batch = list(itertools.islice(file_iterator, self.batch_size))
                 if not batch:
                     break
                 yield batch
+        
+        try:
+            yield batches()
         finally:
             # Any cleanup needed when processing is done
             pass
@@ -213,4 +227,36 @@ class MemoryBudgetedFileCrawler(FileCrawler):
                 file_path._memory_warning = True
                 
             self.current_memory_usage += estimated_size
-            yield file_path
\ No newline at end of file
+            yield file_path
+
+
+@contextmanager
+def get_python_files_batched(
+    directory: str,
+    batch_size: int = 1000,
+    follow_symlinks: bool = False,
+    excluded_dirs: Optional[Set[str]] = None,
+    stat_cache: Optional[Dict[str, os.stat_result]] = None
+) -> Iterator[Iterator[List[pathlib.Path]]]:
+    """
+    Convenience context manager yielding an iterator over batches of Python files.
+    
+    Args:
+        directory: Directory to scan
+        batch_size: Maximum number of files per batch
+        follow_symlinks: Whether to follow symbolic links
+        excluded_dirs: Additional directories to exclude
+        stat_cache: Optional dict filled with each yielded file's stat result,
+            keyed by path string
+        
+    Yields:
+        Iterator of lists, each containing at most batch_size paths
+    """
+    crawler = FileCrawler(
+        follow_symlinks=follow_symlinks,
+        excluded_dirs=excluded_dirs,
+        batch_size=batch_size,
+        stat_cache=stat_cache
+    )
+    with crawler.batch_processor(directory) as batches:
+        yield batches
@@ -0,0 +1,84 @@
+import sys
+import hashlib
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the project root to sys.path
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from index.codebase_index import CodebaseIndex
+from parser import ast_cache
+from parser.ast_cache import ASTCache
+
+
+SOURCE = b"def alpha():\n    pass\n"
+
+# Stands in for the optional xxhash package: same 128-bit hex digest shape
+FAKE_XXHASH = SimpleNamespace(xxh3_128=lambda data: hashlib.blake2b(data, digest_size=16))
+
+
+class TestASTCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache_root = Path(self._tmpdir.name)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_hashes_use_separate_directories(self):
+        with patch.object(ast_cache, "xxhash", FAKE_XXHASH):
+            fast = ASTCache(self.cache_root)
+            strict = ASTCache(self.cache_root, strict=True)
+
+            fast.parse(SOURCE)
+            strict.parse(SOURCE)
+            strict.parse(SOURCE)
+
+        self.assertEqual(fast.hash_name, "xxh3")
+        self.assertEqual(strict.hash_name, "sha256")
+        self.assertTrue(fast.cache_dir.name.endswith("-xxh3"))
+        self.assertTrue(strict.cache_dir.name.endswith("-sha256"))
+
+        # Each cache missed once; neither was served the other's entry
+        self.assertEqual((fast.hits, fast.misses), (0, 1))
+        self.assertEqual((strict.hits, strict.misses), (1, 1))
+
+        xxh3_key = FAKE_XXHASH.xxh3_128(SOURCE).hexdigest()
+        sha256_key = hashlib.sha256(SOURCE).hexdigest()
+        self.assertTrue((fast.cache_dir / xxh3_key[:2] / f"{xxh3_key}.pickle").is_file())
+        self.assertTrue((strict.cache_dir / sha256_key[:2] / f"{sha256_key}.pickle").is_file())
+
+    def test_unpicklable_tree_is_parsed_but_not_cached(self):
+        branches = "".join(f"    elif x == {i}:\n        return {i}\n" for i in range(1, 500))
+        source = f"def dispatch(x):\n    if x == 0:\n        return 0\n{branches}".encode()
+        cache = ASTCache(self.cache_root)
+
+        with self.assertLogs(ast_cache.__name__, level="WARNING"):
+            tree = cache.parse(source, filename="dispatch.py")
+
+        self.assertEqual(tree.body[0].name, "dispatch")
+        self.assertIsNone(cache.load(source))
+        self.assertEqual(list(cache.cache_dir.rglob("*.tmp")), [])
+
+    def test_falls_back_to_sha256_without_xxhash(self):
+        with patch.object(ast_cache, "xxhash", None):
+            cache = ASTCache(self.cache_root)
+
+        self.assertEqual(cache.hash_name, "sha256")
+        self.assertEqual(cache.source_key(SOURCE), hashlib.sha256(SOURCE).hexdigest())
+
+    def test_index_passes_strict_to_its_cache(self):
+        with patch.object(ast_cache, "xxhash", FAKE_XXHASH):
+            index = CodebaseIndex(ast_cache_dir=self.cache_root, ast_cache_strict=True)
+
+        self.assertEqual(index._parser.ast_cache.hash_name, "sha256")
+
+
+if __name__ == "__main__":
+    unittest.main()
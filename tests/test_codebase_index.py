@@ -0,0 +1,264 @@
+import os
+import sys
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the project root to sys.path
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from index.codebase_index import CodebaseIndex, LRUCache
+from parser.visitor import ASTParser
+
+
+SAMPLE_SOURCE = (
+    "def alpha():\n"
+    "    pass\n"
+    "\n"
+    "def beta():\n"
+    "    pass\n"
+)
+
+
+class TestCodebaseIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self._tmpdir.name)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _write(self, name: str, source: str) -> Path:
+        path = self.tmp_path / name
+        path.write_text(source, encoding="utf-8")
+        return path
+
+    def test_add_elements_matches_add_element(self):
+        path = self._write("sample.py", SAMPLE_SOURCE)
+        elements = ASTParser().parse_file(str(path))
+
+        single = CodebaseIndex(lazy_loading=False)
+        for element in elements:
+            single.add_element(element)
+
+        bulk = CodebaseIndex(lazy_loading=False)
+        added = bulk.add_elements(elements)
+
+        self.assertEqual(added, len(elements))
+        self.assertEqual(bulk.total_elements, single.total_elements)
+        self.assertEqual(
+            sorted(e.name for e in bulk.get_by_prefix("")),
+            sorted(e.name for e in single.get_by_prefix(""))
+        )
+
+    def test_build_index_from_directory(self):
+        self._write("sample.py", SAMPLE_SOURCE)
+        self._write("other.py", "def gamma():\n    pass\n")
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path, batch_size=1)
+
+        elements = index.get_by_prefix("")
+        self.assertEqual(sorted(e.name for e in elements), ["alpha", "beta", "gamma"])
+        self.assertTrue(all(e.ast_node is None for e in elements))
+
+    def test_build_index_in_worker_processes(self):
+        expected = []
+        for i in range(10):
+            self._write(f"mod{i}.py", f"def func{i}():\n    pass\n")
+            expected.append(f"func{i}")
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path, max_workers=2)
+
+        elements = index.get_by_prefix("")
+        self.assertEqual(sorted(e.name for e in elements), sorted(expected))
+        self.assertTrue(all(e.ast_node is None for e in elements))
+
+    def test_ast_cache_serves_unchanged_files(self):
+        self._write("sample.py", SAMPLE_SOURCE)
+        cache_dir = self.tmp_path / ".ast_cache"
+
+        first = CodebaseIndex(lazy_loading=False, ast_cache_dir=cache_dir)
+        first.build_index_from_directory(self.tmp_path)
+        cache = first._parser.ast_cache
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        second = CodebaseIndex(lazy_loading=False, ast_cache_dir=cache_dir)
+        second.build_index_from_directory(self.tmp_path)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(
+            sorted(e.name for e in second.get_by_prefix("")),
+            ["alpha", "beta"]
+        )
+
+    def test_rebuild_skips_unchanged_files(self):
+        self._write("sample.py", SAMPLE_SOURCE)
+        other = self._write("other.py", "def gamma():\n    pass\n")
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path)
+        index_path = self.tmp_path / "saved.idx"
+        index.save_to_file(index_path)
+
+        other.write_text("def gamma():\n    pass\n\ndef delta():\n    pass\n", encoding="utf-8")
+        os.utime(other, ns=(0, 0))
+
+        reloaded = CodebaseIndex.load_from_file(index_path)
+        with patch.object(reloaded._parser, "parse_file", wraps=reloaded._parser.parse_file) as parse_file:
+            reloaded.build_index_from_directory(self.tmp_path)
+
+        self.assertEqual([Path(c.args[0]).name for c in parse_file.call_args_list], ["other.py"])
+        names = sorted(e.name for e in reloaded.get_by_prefix(""))
+        self.assertEqual(names, ["alpha", "beta", "delta", "gamma"])
+
+    def test_rebuild_replaces_elements_of_changed_and_deleted_files(self):
+        sample = self._write("sample.py", SAMPLE_SOURCE)
+        other = self._write("other.py", "def gamma():\n    pass\n")
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path)
+
+        sample.write_text("def alpha():\n    pass\n\ndef renamed():\n    pass\n", encoding="utf-8")
+        other.unlink()
+        index.build_index_from_directory(self.tmp_path)
+
+        names = sorted(e.name for e in index.get_by_prefix(""))
+        self.assertEqual(names, ["alpha", "renamed"])
+        self.assertEqual(index.total_elements, 2)
+        self.assertEqual(index.get_elements_in_file(other), [])
+
+    def test_rebuild_skips_touched_but_identical_files(self):
+        sample = self._write("sample.py", SAMPLE_SOURCE)
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path, max_workers=1)
+        self.assertIsNone(index._file_mtimes[str(sample.resolve())][2])
+
+        # First mismatch: no digest to compare yet, so the file is parsed
+        # once more and its digest recorded
+        os.utime(sample, ns=(0, 0))
+        index.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        os.utime(sample, ns=(10**9, 10**9))
+        with patch.object(index._parser, "parse_file", wraps=index._parser.parse_file) as parse_file:
+            index.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        self.assertEqual(parse_file.call_count, 0)
+        self.assertEqual(sorted(e.name for e in index.get_by_prefix("")), ["alpha", "beta"])
+
+    def test_failed_build_retries_changed_files(self):
+        changed = self._write("a.py", "def a():\n    pass\n")
+        broken = self._write("b.py", "def b():\n    pass\n")
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        changed.write_text("def a2():\n    pass\n", encoding="utf-8")
+        broken.write_text("def b(:\n", encoding="utf-8")
+        with self.assertRaises(SyntaxError):
+            index.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        broken.write_text("def b():\n    pass\n", encoding="utf-8")
+        index.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        names = sorted(e.name for e in index.get_by_prefix(""))
+        self.assertEqual(names, ["a2", "b"])
+
+    def test_rebuild_of_loaded_index_clears_search_tokens(self):
+        sample = self._write("sample.py", SAMPLE_SOURCE)
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path, max_workers=1)
+        alpha_id = next(k for k, v in index._elements.items() if v.name == "alpha")
+        index._token_index["alpha"].add(alpha_id)
+        index_path = self.tmp_path / "saved.idx"
+        index.save_to_file(index_path)
+
+        sample.write_text("def renamed():\n    pass\n\ndef beta():\n    pass\n", encoding="utf-8")
+        reloaded = CodebaseIndex.load_from_file(index_path)
+        reloaded.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        self.assertNotIn("alpha", reloaded._token_index)
+
+    def test_rebuild_keeps_same_named_definitions_from_other_files(self):
+        for renamed in ("a.py", "b.py"):
+            with self.subTest(renamed=renamed):
+                root = self.tmp_path / renamed.replace(".", "_")
+                root.mkdir()
+                for name in ("a.py", "b.py"):
+                    (root / name).write_text("def helper():\n    pass\n", encoding="utf-8")
+
+                index = CodebaseIndex(lazy_loading=False)
+                index.build_index_from_directory(root, max_workers=1)
+
+                (root / renamed).write_text("def helper2():\n    pass\n", encoding="utf-8")
+                index.build_index_from_directory(root, max_workers=1)
+
+                names = sorted(e.name for e in index.get_by_prefix(""))
+                self.assertEqual(names, ["helper", "helper2"])
+
+    def test_rebuild_after_deleting_files_sharing_a_name(self):
+        # Top-level files are scanned first, so a deleted file owns the id
+        deleted = [self._write(name, "def helper():\n    pass\n") for name in ("a.py", "b.py")]
+        package = self.tmp_path / "package"
+        package.mkdir()
+        (package / "c.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+
+        index = CodebaseIndex(lazy_loading=False)
+        index.build_index_from_directory(self.tmp_path, max_workers=1)
+        self.assertNotEqual(Path(index.get_by_prefix("")[0].file_path).name, "c.py")
+
+        for path in deleted:
+            path.unlink()
+        with self.assertNoLogs("index.codebase_index", level="WARNING"):
+            index.build_index_from_directory(self.tmp_path, max_workers=1)
+
+        elements = index.get_by_prefix("")
+        self.assertEqual([Path(e.file_path).name for e in elements], ["c.py"])
+
+    def test_lazy_loads_parse_each_file_once(self):
+        path = self._write("sample.py", SAMPLE_SOURCE)
+
+        index = CodebaseIndex(lazy_loading=True)
+        index.add_elements(ASTParser().parse_file(str(path)))
+
+        with patch.object(index._parser, "parse_file", wraps=index._parser.parse_file) as parse_file:
+            names = sorted(e.name for e in index.get_by_prefix(""))
+
+        self.assertEqual(names, ["alpha", "beta"])
+        self.assertEqual(parse_file.call_count, 1)
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now the oldest
+
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_put_existing_key_refreshes_usage(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 10)
+
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()